@@ -24,27 +24,39 @@
 # --------------------------------------------
 
 # From shiny, import just reactive and render
-from shiny import reactive, render
+from shiny import reactive, render, req
 
 # From shiny.express, import just ui and inputs if needed
 from shiny.express import ui
 
 # Standard Python libraries
-import random
 from datetime import datetime
-from collections import deque
-import pandas as pd
+import numpy as np
+import pyarrow as pa
 
 # Plotly for data visualization
-import plotly.express as px
+import plotly.graph_objects as go
 from shinywidgets import render_plotly
 
-# SciPy for statistical regression
-from scipy import stats
-
 # Custom theme for UI
 from shinyswatch import theme
 
+# Constants and numeric kernels shared by all sessions
+from shared import (
+    COLS,
+    DEQUE_SIZE,
+    HI,
+    LABELS,
+    LO,
+    RNG,
+    TEMPLATE,
+    THRESH,
+    X,
+    X_MEAN,
+    X_VAR,
+    regression_kernel,
+)
+
 # --------------------------------------------
 # Import icons as needed
 # --------------------------------------------
@@ -57,41 +69,110 @@ from faicons import icon_svg
 # Time interval for live data updates (in seconds)
 UPDATE_INTERVAL_SECS: int = 10
 
-# Initialize a REACTIVE VALUE using a deque (a queue with a fixed length)
-DEQUE_SIZE: int = 5
-reactive_value_wrapper = reactive.value(deque(maxlen=DEQUE_SIZE))
+# Preallocated column buffers (one array per column) used as a ring buffer.
+# _head is the next slot to write and _count the number of valid readings.
+_buf = {
+    "timestamp": np.empty(DEQUE_SIZE, dtype="datetime64[s]"),
+    "temp": np.empty(DEQUE_SIZE),
+    "barometric_pressure_hpa": np.empty(DEQUE_SIZE),
+}
+_head: int = 0
+_count: int = 0
+
+# Display-formatted timestamp for each slot, written once at ingest
+_ts_str = np.empty(DEQUE_SIZE, dtype=object)
+
+# REACTIVE VALUE holding a generation counter; the producer bumps it after each
+# write so renders re-run, then read the buffers above directly
+_gen = reactive.value(0)
+
+# Preallocated output buffer for the regression line
+_FIT_BUF = np.empty(DEQUE_SIZE)
+
+# Above this many readings, downsample the plot with plotly-resampler (optional dependency)
+RESAMPLE_THRESHOLD: int = 1000
+_RESAMPLE = DEQUE_SIZE > RESAMPLE_THRESHOLD
+
+# Persistent figure: built once, then only its trace data is updated each tick.
+# WebGL traces keep client render time flat if DEQUE_SIZE grows.
+# An empty template and a trimmed modebar keep the serialized figure small.
+# The layout is passed to the constructor: a bare FIG.update_layout(...) call would
+# send the returned figure to Shiny Express's display hook, which cannot render it.
+_LAYOUT = go.Layout(
+    title="Temperature Readings with Regression Line",
+    xaxis_title="Time",
+    yaxis_title="Temperature (°C)",
+    xaxis_type="date",
+    template=TEMPLATE,
+    modebar_remove=["lasso2d", "select2d", "autoScale2d", "toggleSpikelines"],
+)
+_TRACES = (
+    go.Scattergl(mode="markers", name="Readings", marker=dict(color="blue")),
+    go.Scattergl(mode="lines", name="Regression Line"),
+)
+if _RESAMPLE:
+    from plotly_resampler import FigureWidgetResampler
+
+    # Traces are registered as high-frequency data (placeholder values until the first tick)
+    # so the browser only receives a MinMaxLTTB-downsampled view of each trace
+    FIG = FigureWidgetResampler(go.Figure(layout=_LAYOUT), default_n_shown_samples=2000)
+    _placeholder_x = np.arange(DEQUE_SIZE).astype("datetime64[s]")
+    for trace in _TRACES:
+        # Assigned so the returned figure is not sent to the Express display hook
+        _ = FIG.add_trace(trace, hf_x=_placeholder_x, hf_y=np.zeros(DEQUE_SIZE), limit_to_view=True)
+else:
+    FIG = go.FigureWidget(list(_TRACES), layout=_LAYOUT)
 
 # --------------------------------------------
-# Reactive Calculation for Live Data
+# Reactive Effect Producing Live Data
 # --------------------------------------------
-@reactive.calc()
-def reactive_calc_combined():
-    # Invalidate the calculation every UPDATE_INTERVAL_SECS to refresh data
+@reactive.effect
+def _producer():
+    """Generate a new reading every UPDATE_INTERVAL_SECS and write it into the buffers"""
+    global _head, _count
+
+    # Re-run the effect every UPDATE_INTERVAL_SECS, independent of the renders
     reactive.invalidate_later(UPDATE_INTERVAL_SECS)
 
-    # Data generation logic for temperature and barometric pressure
-    temp = round(random.uniform(-18, -16), 1)  # Random temperature in Celsius
-    timestamp = datetime.now().strftime("%m-%d-%Y %H:%M:%S")  # Current timestamp
-    barometric_pressure = round(random.uniform(990, 1020), 1)  # Random barometric pressure in hPa
+    # Data generation logic: random temperature (°C) and barometric pressure (hPa) in one draw
+    temp, barometric_pressure = RNG.uniform(LO, HI)
+    now = datetime.now()
+
+    # Write the new reading in place at the head slot, overwriting the oldest reading
+    slot = _head % DEQUE_SIZE
+    _buf["timestamp"][slot] = np.datetime64(now, "s")  # Current local timestamp
+    _buf["temp"][slot] = temp
+    _buf["barometric_pressure_hpa"][slot] = barometric_pressure  # Barometric pressure in hPa
+    _ts_str[slot] = now.strftime("%m-%d-%Y %H:%M:%S")
+    _head = slot + 1
+    _count = min(_count + 1, DEQUE_SIZE)
+
+    # Bump the generation so that dependent calcs and renders update
+    with reactive.isolate():
+        _gen.set(_gen.get() + 1)
+
+# --------------------------------------------
+# Reactive Calculations for Live Data
+# --------------------------------------------
+@reactive.calc()
+def latest_slot():
+    """Return the buffer slot of the latest reading (no table work)"""
+    req(_gen.get())
+    return (_head - 1) % DEQUE_SIZE
 
-    # New data entry
-    new_entry = {
-        "temp": temp,
-        "temp_fahrenheit": round(temp * 9 / 5 + 32, 1),  # Temperature in Fahrenheit
-        "temp_kelvin": round(temp + 273.15, 1),  # Temperature in Kelvin
-        "barometric_pressure_hpa": barometric_pressure,  # Barometric pressure in hPa
-        "timestamp": timestamp,
-    }
 
-    # Append new entry to the reactive deque
-    reactive_value_wrapper.get().append(new_entry)
+@reactive.calc()
+def ordered_slots():
+    """Return the ring-buffer slots of the valid readings, oldest to newest"""
+    latest_slot()
+    return np.arange(_head - _count, _head) % DEQUE_SIZE
 
-    # Return the full deque, a DataFrame for display, and the latest entry
-    deque_snapshot = reactive_value_wrapper.get()
-    df = pd.DataFrame(deque_snapshot)
-    latest_dictionary_entry = new_entry
 
-    return deque_snapshot, df, latest_dictionary_entry
+@reactive.calc()
+def df():
+    """Return an Arrow table of the most recent readings for the table and plot"""
+    order = ordered_slots()
+    return pa.table({key: column[order] for key, column in _buf.items()})
 
 # --------------------------------------------
 # UI Page Layout Configuration
@@ -129,8 +210,7 @@ with ui.card(full_screen=False):
     @render.text
     def display_time():
         """Fetch and display the latest timestamp"""
-        deque_snapshot, df, latest_dictionary_entry = reactive_calc_combined()
-        return f"{latest_dictionary_entry['timestamp']}"
+        return _ts_str[latest_slot()]
 
 # Card displaying the current temperature with description
 with ui.layout_columns():
@@ -143,20 +223,13 @@ with ui.layout_columns():
         @render.text
         def display_temp():
             """Fetch and display the latest temperature with description based on Celsius"""
-            deque_snapshot, df, latest_entry = reactive_calc_combined()
-            temp = latest_entry["temp"]
-
-            # Temperature description logic
-            if temp < -17.5:
-                description = "Much Colder than Usual"
-            elif -17.5 <= temp < -17.0:
-                description = "Colder than Usual"
-            elif -17.0 <= temp < -16.5:
-                description = "Warmer than Usual"
-            else:
-                description = "Much Hotter than Usual"
+            # Round to the displayed precision first so the label matches the shown value
+            temp = round(float(_buf["temp"][latest_slot()]), 1)
+
+            # Temperature description lookup (side="right" keeps each threshold in the upper band)
+            description = LABELS[int(np.searchsorted(THRESH, temp, side="right"))]
 
-            return f"{temp} °C - {description}"
+            return f"{temp:.1f} °C - {description}"
 
 # Card displaying the current barometric pressure
 with ui.layout_columns():
@@ -169,9 +242,8 @@ with ui.layout_columns():
         @render.text
         def display_pressure():
             """Display the latest barometric pressure reading in hPa"""
-            _, _, latest_entry = reactive_calc_combined()
-            pressure = latest_entry["barometric_pressure_hpa"]
-            return f"{pressure} hPa"
+            pressure = _buf["barometric_pressure_hpa"][latest_slot()]
+            return f"{pressure:.1f} hPa"
 
 # Card displaying the most recent readings in a table
 with ui.card(full_screen=True):
@@ -180,8 +252,22 @@ with ui.card(full_screen=True):
     @render.data_frame
     def display_df():
         """Display the latest readings in a table"""
-        _, df, _ = reactive_calc_combined()
-        return df[["timestamp", "temp", "temp_fahrenheit", "temp_kelvin", "barometric_pressure_hpa"]]
+        readings = df()
+        # Round Celsius to the displayed precision first so Fahrenheit and Kelvin
+        # agree with the shown value
+        temps = np.round(readings["temp"].to_numpy(), 1)
+
+        # Build the table directly in COLS order, deriving Fahrenheit and Kelvin
+        # as whole-column operations and rounding for display. Timestamps use the
+        # strings preformatted at ingest, matching the time card.
+        columns = (
+            pa.array(_ts_str[ordered_slots()], type=pa.string()),
+            temps,
+            np.round(temps * 1.8 + 32, 1),
+            np.round(temps + 273.15, 1),
+            np.round(readings["barometric_pressure_hpa"].to_numpy(), 1),
+        )
+        return pa.table(dict(zip(COLS, columns)))
 
 
 # Card displaying the latest temperature readings with a regression line
@@ -190,43 +276,41 @@ with ui.card():
 
     @render_plotly
     def display_plot():
-        # Fetch from the reactive calc function
-        deque_snapshot, df, latest_dictionary_entry = reactive_calc_combined()
-
-        # Ensure the DataFrame is not empty before plotting
-        if not df.empty:
-            # Convert the 'timestamp' column to datetime for better plotting
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
-
-            # Create scatter plot for readings
-            # pass in the df, the name of the x column, the name of the y column,
-            # and more
-        
-            fig = px.scatter(
-            df,
-            x="timestamp",
-            y="temp",
-            title="Temperature Readings with Regression Line",
-            labels={"temp": "Temperature (°C)", "timestamp": "Time"},
-            color_discrete_sequence=["blue"] )
-            
-            # Linear regression - we need to get a list of the
-            # Independent variable x values (time) and the
-            # Dependent variable y values (temp)
-            # then, it's pretty easy using scipy.stats.linregress()
-
-            # For x let's generate a sequence of integers from 0 to len(df)
-            sequence = range(len(df))
-            x_vals = list(sequence)
-            y_vals = df["temp"]
-
-            slope, intercept, r_value, p_value, std_err = stats.linregress(x_vals, y_vals)
-            df['best_fit_line'] = [slope * x + intercept for x in x_vals]
-
-            # Add the regression line to the figure
-            fig.add_scatter(x=df["timestamp"], y=df['best_fit_line'], mode='lines', name='Regression Line')
-
-            # Update layout as needed to customize further
-            fig.update_layout(xaxis_title="Time",yaxis_title="Temperature (°C)")
-
-        return fig
\ No newline at end of file
+        # Fetch the Arrow table from the reactive calc function
+        readings = df()
+
+        # Ensure the table is not empty before plotting
+        if readings.num_rows:
+            # Timestamps are already datetime64; pass raw ndarrays to Plotly
+            timestamps = readings["timestamp"].to_numpy()
+            temps = readings["temp"].to_numpy()
+
+            # Linear regression - closed-form least squares of temp against
+            # the reading index (0, 1, 2, ...), only slope and intercept are needed
+            n = len(temps)
+            if n == DEQUE_SIZE:
+                x_vals, x_mean, x_var = X, X_MEAN, X_VAR
+            else:
+                x_vals = X[:n]
+                x_mean = x_vals.mean()
+                x_var = ((x_vals - x_mean) ** 2).sum()
+
+            best_fit_line = _FIT_BUF[:n]
+            regression_kernel(temps, x_vals, x_mean, x_var, best_fit_line)
+
+            if _RESAMPLE:
+                # Replace the high-frequency data and let the resampler push a downsampled view
+                FIG.hf_data[0]["x"] = timestamps
+                FIG.hf_data[0]["y"] = temps
+                FIG.hf_data[1]["x"] = timestamps
+                FIG.hf_data[1]["y"] = best_fit_line.copy()
+                FIG.reload_data()
+            else:
+                # Update the persistent figure's traces in a single batch
+                with FIG.batch_update():
+                    FIG.data[0].x = timestamps
+                    FIG.data[0].y = temps
+                    FIG.data[1].x = timestamps
+                    FIG.data[1].y = best_fit_line
+
+        return FIG
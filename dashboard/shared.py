@@ -0,0 +1,69 @@
+# --------------------------------------------
+# Elias Analytics- Shared Constants and Kernels
+# --------------------------------------------
+#
+# Shiny Express re-executes app.py for every session, but an imported module
+# is executed only once per process. Everything here is immutable (or, like the
+# random generator, safe to share), so each new browser session reuses it
+# instead of redoing the numeric setup.
+# --------------------------------------------
+
+import numpy as np
+
+# Plotly for the figure template
+import plotly.graph_objects as go
+
+# Numba JIT for the regression kernel (optional: not available under Shinylive/Pyodide)
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Fallback when numba is not installed: run the kernel as plain NumPy code"""
+        return lambda func: func
+
+# --------------------------------------------
+# Constants
+# --------------------------------------------
+
+# Number of most recent readings to keep
+DEQUE_SIZE: int = 5
+
+# Canonical column order for the readings table
+COLS = ("timestamp", "temp", "temp_fahrenheit", "temp_kelvin", "barometric_pressure_hpa")
+
+# Random generator and (temperature °C, pressure hPa) ranges for simulated readings
+RNG = np.random.default_rng()
+LO = np.array([-18.0, 990.0])
+HI = np.array([-16.0, 1020.0])
+
+# Temperature description thresholds (°C) and the label for each band
+THRESH = np.array([-17.5, -17.0, -16.5])
+LABELS = (
+    "Much Colder than Usual",
+    "Colder than Usual",
+    "Warmer than Usual",
+    "Much Hotter than Usual",
+)
+
+# Regression x values (reading index) specialized for a full buffer
+X = np.arange(DEQUE_SIZE, dtype=float)
+X_MEAN = X.mean()
+X_VAR = ((X - X_MEAN) ** 2).sum()
+
+# An empty template keeps the serialized figure small
+TEMPLATE = go.layout.Template()
+
+# --------------------------------------------
+# Numeric Kernel for the Regression Line
+# --------------------------------------------
+@njit(cache=True)
+def regression_kernel(y, x, x_mean, x_var, fit_out):
+    """Closed-form least squares of y against x, writing the fitted line into fit_out"""
+    y_mean = y.mean()
+    slope = 0.0
+    if x_var:
+        slope = ((x - x_mean) * (y - y_mean)).sum() / x_var
+    intercept = y_mean - slope * x_mean
+    np.multiply(x, slope, fit_out)
+    fit_out += intercept
+    return slope, intercept